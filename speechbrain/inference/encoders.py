@@ -138,7 +138,10 @@ class MelSpectrogramEncoder(Pretrained):
 
     def dynamic_range_compression(self, x, C=1, clip_val=1e-5):
         """Dynamic range compression for audio signals"""
-        return torch.log(torch.clamp(x, min=clip_val) * C)
+        x = torch.clamp(x, min=clip_val)
+        if C != 1:
+            x = x * C
+        return torch.log(x)
 
     def mel_spectogram(self, audio):
         """calculates MelSpectrogram for a raw audio signal
@@ -731,8 +731,10 @@ class FastSpeech2(nn.Module):
             durations if durations is not None else dur_pred_reverse_log,
             pace=pace,
         )
-        srcmask = get_mask_from_lengths(torch.tensor(mel_lens))
-        srcmask = srcmask.to(spec_feats.device)
+        srcmask = get_mask_from_lengths(
+            torch.tensor(mel_lens, device=spec_feats.device),
+            max_len=spec_feats.shape[1],
+        )
         srcmask_inverted = (~srcmask).unsqueeze(-1)
         attn_mask = (
             srcmask.unsqueeze(-1)
@@ -1232,7 +1234,10 @@ def mel_spectogram(
 
 def dynamic_range_compression(x, C=1, clip_val=1e-5):
     """Dynamic range compression for audio signals"""
-    return torch.log(torch.clamp(x, min=clip_val) * C)
+    x = torch.clamp(x, min=clip_val)
+    if C != 1:
+        x = x * C
+    return torch.log(x)
 
 
 class SSIMLoss(torch.nn.Module):
@@ -2536,8 +2541,10 @@ class FastSpeech2WithAlignment(nn.Module):
             ),
             pace=pace,
         )
-        srcmask = get_mask_from_lengths(torch.tensor(mel_lens))
-        srcmask = srcmask.to(spec_feats.device)
+        srcmask = get_mask_from_lengths(
+            torch.tensor(mel_lens, device=spec_feats.device),
+            max_len=spec_feats.shape[1],
+        )
         srcmask_inverted = (~srcmask).unsqueeze(-1)
         attn_mask = (
             srcmask.unsqueeze(-1)
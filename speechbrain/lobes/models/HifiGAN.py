@@ -32,9 +32,12 @@ Authors
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import functools
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+import torch.utils.checkpoint
 from torchaudio import transforms
 
 import speechbrain as sb
@@ -45,10 +48,14 @@ LRELU_SLOPE = 0.1
 
 def dynamic_range_compression(x, C=1, clip_val=1e-5):
     """Dynamic range compression for audio signals"""
-    return torch.log(torch.clamp(x, min=clip_val) * C)
+    x = torch.clamp(x, min=clip_val)
+    if C != 1:
+        x = x * C
+    return torch.log(x)
 
 
-def mel_spectogram(
+@functools.lru_cache(maxsize=8)
+def _get_mel_transform(
     sample_rate,
     hop_length,
     win_length,
@@ -60,10 +67,14 @@ def mel_spectogram(
     normalized,
     norm,
     mel_scale,
-    compression,
-    audio,
+    device,
 ):
-    """calculates MelSpectrogram for a raw audio signal
+    """Returns a MelSpectrogram transform for the given parameters.
+
+    The transform (filterbank and window included) is built and moved to
+    ``device`` only once per set of parameters, as ``mel_spectogram`` is
+    called for every utterance in the data pipelines of the vocoder recipes
+    and twice per training step by ``L1SpecLoss``.
 
     Arguments
     ---------
@@ -89,18 +100,15 @@ def mel_spectogram(
         If "slaney", divide the triangular mel weights by the width of the mel band
     mel_scale : str
         Scale to use: "htk" or "slaney".
-    compression : bool
-        whether to do dynamic range compression
-    audio : torch.Tensor
-        input audio signal
+    device : torch.device
+        The device the transform is moved to.
 
     Returns
     -------
-    mel : torch.Tensor
-        The mel spectrogram corresponding to the input audio.
+    audio_to_mel : torchaudio.transforms.MelSpectrogram
+        The (shared) transform.
     """
-
-    audio_to_mel = transforms.MelSpectrogram(
+    return transforms.MelSpectrogram(
         sample_rate=sample_rate,
         hop_length=hop_length,
         win_length=win_length,
@@ -112,7 +120,75 @@ def mel_spectogram(
         normalized=normalized,
         norm=norm,
         mel_scale=mel_scale,
-    ).to(audio.device)
+    ).to(device)
+
+
+def mel_spectogram(
+    sample_rate,
+    hop_length,
+    win_length,
+    n_fft,
+    n_mels,
+    f_min,
+    f_max,
+    power,
+    normalized,
+    norm,
+    mel_scale,
+    compression,
+    audio,
+):
+    """calculates MelSpectrogram for a raw audio signal
+
+    Arguments
+    ---------
+    sample_rate : int
+        Sample rate of audio signal.
+    hop_length : int
+        Length of hop between STFT windows.
+    win_length : int
+        Window size.
+    n_fft : int
+        Size of FFT.
+    n_mels : int
+        Number of mel filterbanks.
+    f_min : float
+        Minimum frequency.
+    f_max : float
+        Maximum frequency.
+    power : float
+        Exponent for the magnitude spectrogram.
+    normalized : bool
+        Whether to normalize by magnitude after stft.
+    norm : str or None
+        If "slaney", divide the triangular mel weights by the width of the mel band
+    mel_scale : str
+        Scale to use: "htk" or "slaney".
+    compression : bool
+        whether to do dynamic range compression
+    audio : torch.Tensor
+        input audio signal
+
+    Returns
+    -------
+    mel : torch.Tensor
+        The mel spectrogram corresponding to the input audio.
+    """
+
+    audio_to_mel = _get_mel_transform(
+        sample_rate,
+        hop_length,
+        win_length,
+        n_fft,
+        n_mels,
+        f_min,
+        f_max,
+        power,
+        normalized,
+        norm,
+        mel_scale,
+        audio.device,
+    )
 
     mel = audio_to_mel(audio)
 
@@ -399,6 +475,10 @@ class HifiganGenerator(torch.nn.Module):
         Default 0
     conv_post_bias : bool
         Default True
+    gradient_checkpointing : bool
+        If True, the activations of each upsampling + MRF stage are recomputed
+        during the backward pass instead of being stored, trading compute for
+        memory during training. Default False
 
     Example
     -------
@@ -431,9 +511,11 @@ class HifiganGenerator(torch.nn.Module):
         inference_padding=5,
         cond_channels=0,
         conv_post_bias=True,
+        gradient_checkpointing=False,
     ):
         super().__init__()
         self.inference_padding = inference_padding
+        self.gradient_checkpointing = gradient_checkpointing
         self.num_kernels = len(resblock_kernel_sizes)
         self.num_upsamples = len(upsample_factors)
         # initial upsampling layers
@@ -482,6 +564,7 @@ class HifiganGenerator(torch.nn.Module):
             bias=conv_post_bias,
             weight_norm=True,
         )
+        self.cond_layer = None
         if cond_channels > 0:
             self.cond_layer = Conv1d(
                 in_channels=cond_channels,
@@ -505,23 +588,42 @@ class HifiganGenerator(torch.nn.Module):
         """
 
         o = self.conv_pre(x)
-        if hasattr(self, "cond_layer"):
+        if self.cond_layer is not None:
             o = o + self.cond_layer(g)
         for i in range(self.num_upsamples):
-            o = F.leaky_relu(o, LRELU_SLOPE)
-            o = self.ups[i](o)
-            z_sum = None
-            for j in range(self.num_kernels):
-                if z_sum is None:
-                    z_sum = self.resblocks[i * self.num_kernels + j](o)
-                else:
-                    z_sum += self.resblocks[i * self.num_kernels + j](o)
-            o = z_sum / self.num_kernels
+            if self.gradient_checkpointing and self.training:
+                o = torch.utils.checkpoint.checkpoint(
+                    self._upsample_mrf, o, i, use_reentrant=False
+                )
+            else:
+                o = self._upsample_mrf(o, i)
         o = F.leaky_relu(o)
         o = self.conv_post(o)
         o = torch.tanh(o)
         return o
 
+    def _upsample_mrf(self, o, i):
+        """Applies the i-th upsampling layer followed by its MRF blocks.
+
+        Arguments
+        ---------
+        o : torch.Tensor (batch, channel, time)
+            input tensor of the stage.
+        i : int
+            index of the upsampling stage.
+
+        Returns
+        -------
+        o : torch.Tensor
+            The averaged output of the MRF blocks
+        """
+        o = F.leaky_relu(o, LRELU_SLOPE)
+        o = self.ups[i](o)
+        z_sum = self.resblocks[i * self.num_kernels](o)
+        for j in range(1, self.num_kernels):
+            z_sum += self.resblocks[i * self.num_kernels + j](o)
+        return z_sum / self.num_kernels
+
     def remove_weight_norm(self):
         """This functions removes weight normalization during inference."""
 
@@ -673,6 +775,9 @@ class UnitHifiganGenerator(HifiganGenerator):
         size of the convolution filter in each layer of the duration predictor.
     var_pred_dropout : float
         dropout probability of each layer in the duration predictor.
+    gradient_checkpointing : bool
+        If True, recompute the upsampling + MRF activations in the backward
+        pass instead of storing them. Default False
 
     Example
     -------
@@ -717,6 +822,7 @@ class UnitHifiganGenerator(HifiganGenerator):
         var_pred_hidden_dim=128,
         var_pred_kernel_size=3,
         var_pred_dropout=0.5,
+        gradient_checkpointing=False,
     ):
         super().__init__(
             in_channels,
@@ -730,6 +836,7 @@ class UnitHifiganGenerator(HifiganGenerator):
             inference_padding,
             cond_channels,
             conv_post_bias,
+            gradient_checkpointing,
         )
         self.unit_embedding = torch.nn.Embedding(num_embeddings, embedding_dim)
         self.duration_predictor = duration_predictor
@@ -1100,17 +1207,22 @@ class HifiganDiscriminator(nn.Module):
 #################################
 
 
-def stft(x, n_fft, hop_length, win_length, window_fn="hann_window"):
+def stft(
+    x, n_fft, hop_length, win_length, window_fn="hann_window", window=None
+):
     """computes the Fourier transform of short overlapping windows of the input"""
+    if window is None:
+        window = getattr(torch, window_fn)(win_length, device=x.device)
     o = torch.stft(
         x.squeeze(1),
         n_fft,
         hop_length,
         win_length,
+        window=window,
+        return_complex=True,
     )
-    M = o[:, :, :, 0]
-    P = o[:, :, :, 1]
-    S = torch.sqrt(torch.clamp(M**2 + P**2, min=1e-8))
+    # sqrt(clamp(M**2 + P**2, min=1e-8)) computed as a single magnitude pass
+    S = torch.clamp(o.abs(), min=1e-4)
     return S
 
 
@@ -1134,6 +1246,9 @@ class STFTLoss(nn.Module):
         self.n_fft = n_fft
         self.hop_length = hop_length
         self.win_length = win_length
+        self.register_buffer(
+            "window", torch.hann_window(win_length), persistent=False
+        )
 
     def forward(self, y_hat, y):
         """Returns magnitude loss and spectral convergence loss
@@ -1153,12 +1268,25 @@ class STFTLoss(nn.Module):
             Spectral convergence loss
         """
 
-        y_hat_M = stft(y_hat, self.n_fft, self.hop_length, self.win_length)
-        y_M = stft(y, self.n_fft, self.hop_length, self.win_length)
-        # magnitude loss
-        loss_mag = F.l1_loss(torch.log(y_M), torch.log(y_hat_M))
+        if self.window.device != y.device:
+            self.window = self.window.to(y.device)
+        y_hat_M = stft(
+            y_hat,
+            self.n_fft,
+            self.hop_length,
+            self.win_length,
+            window=self.window,
+        )
+        y_M = stft(
+            y, self.n_fft, self.hop_length, self.win_length, window=self.window
+        )
+        # magnitude loss: |log(a) - log(b)| == |log(a / b)|, which needs a
+        # single log pass instead of one per spectrogram
+        loss_mag = torch.log(y_M / y_hat_M).abs().mean()
         # spectral convergence loss
-        loss_sc = torch.norm(y_M - y_hat_M, p="fro") / torch.norm(y_M, p="fro")
+        loss_sc = torch.linalg.vector_norm(
+            y_M - y_hat_M
+        ) / torch.linalg.vector_norm(y_M)
         return loss_mag, loss_sc
 
 
@@ -1350,8 +1478,10 @@ class MSEGLoss(nn.Module):
             Generator loss
         """
 
+        # Targets are stride-0 views of a single element, so no full-size
+        # ones tensor is allocated for each discriminator
         loss_fake = F.mse_loss(
-            score_fake, score_fake.new_ones(score_fake.shape)
+            score_fake, score_fake.new_ones(1).expand_as(score_fake)
         )
         return loss_fake
 
@@ -1383,13 +1513,14 @@ class MelganFeatureLoss(nn.Module):
             Feature matching loss
         """
 
-        loss_feats = 0
-        num_feats = 0
-        for idx, _ in enumerate(fake_feats):
-            for fake_feat, real_feat in zip(fake_feats[idx], real_feats[idx]):
-                loss_feats += self.loss_func(fake_feat, real_feat)
-                num_feats += 1
-        loss_feats = loss_feats / num_feats
+        # Per-layer losses are gathered and reduced once, rather than
+        # accumulated through a chain of scalar additions
+        layer_losses = [
+            self.loss_func(fake_feat, real_feat)
+            for fake_layers, real_layers in zip(fake_feats, real_feats)
+            for fake_feat, real_feat in zip(fake_layers, real_layers)
+        ]
+        loss_feats = torch.stack(layer_losses).mean()
         return loss_feats
 
 
@@ -1429,10 +1560,10 @@ class MSEDLoss(nn.Module):
         """
 
         loss_real = self.loss_func(
-            score_real, score_real.new_ones(score_real.shape)
+            score_real, score_real.new_ones(1).expand_as(score_real)
         )
         loss_fake = self.loss_func(
-            score_fake, score_fake.new_zeros(score_fake.shape)
+            score_fake, score_fake.new_zeros(1).expand_as(score_fake)
         )
         loss_d = loss_real + loss_fake
         return loss_d, loss_real, loss_fake
@@ -1462,9 +1593,11 @@ def _apply_G_adv_loss(scores_fake, loss_func):
 
     adv_loss = 0
     if isinstance(scores_fake, list):
-        for score_fake in scores_fake:
-            fake_loss = loss_func(score_fake)
-            adv_loss += fake_loss
+        # Scores have different sizes per discriminator, so the per-scale
+        # losses are reduced together rather than concatenating the scores
+        adv_loss = torch.stack(
+            [loss_func(score_fake) for score_fake in scores_fake]
+        ).sum()
         # adv_loss /= len(scores_fake)
     else:
         fake_loss = loss_func(scores_fake)
@@ -1499,13 +1632,17 @@ def _apply_D_loss(scores_fake, scores_real, loss_func):
     fake_loss = 0
     if isinstance(scores_fake, list):
         # multi-scale loss
+        total_losses, real_losses, fake_losses = [], [], []
         for score_fake, score_real in zip(scores_fake, scores_real):
-            total_loss, real_loss, fake_loss = loss_func(
+            total_loss, scale_real_loss, scale_fake_loss = loss_func(
                 score_fake=score_fake, score_real=score_real
             )
-            loss += total_loss
-            real_loss += real_loss
-            fake_loss += fake_loss
+            total_losses.append(total_loss)
+            real_losses.append(scale_real_loss)
+            fake_losses.append(scale_fake_loss)
+        loss = torch.stack(total_losses).sum()
+        real_loss = torch.stack(real_losses).sum()
+        fake_loss = torch.stack(fake_losses).sum()
         # normalize loss values with number of scales (discriminators)
         # loss /= len(scores_fake)
         # real_loss /= len(scores_real)
@@ -480,8 +480,6 @@ class Loss(nn.Module):
         self.spk_emb_loss_weight = spk_emb_loss_weight
         self.spk_emb_loss_type = spk_emb_loss_type
 
-        self.mse_loss = nn.MSELoss()
-        self.bce_loss = nn.BCEWithLogitsLoss()
         self.guided_attention_loss = GuidedAttentionLoss(
             sigma=guided_attention_sigma
         )
@@ -539,13 +537,15 @@ class Loss(nn.Module):
         ) = model_output
 
         gate_out = gate_out.view(-1, 1)
-        mel_loss = self.mse_loss(mel_out, mel_target) + self.mse_loss(
+        mel_loss = F.mse_loss(mel_out, mel_target) + F.mse_loss(
             mel_out_postnet, mel_target
         )
 
         mel_loss = self.mel_loss_weight * mel_loss
 
-        gate_loss = self.gate_loss_weight * self.bce_loss(gate_out, gate_target)
+        gate_loss = self.gate_loss_weight * F.binary_cross_entropy_with_logits(
+            gate_out, gate_target
+        )
         attn_loss, attn_weight = self.get_attention_loss(
             alignments, input_lengths, target_lengths, epoch
         )
@@ -620,15 +620,27 @@ class Loss(nn.Module):
                 and epoch > self.guided_attention_hard_stop
             )
             if hard_stop_reached:
-                attn_weight, attn_loss = zero_tensor, zero_tensor
+                attn_weight = 0.0
             else:
                 attn_weight = self.guided_attention_weight
                 if self.guided_attention_scheduler is not None:
                     _, attn_weight = self.guided_attention_scheduler(epoch)
-            attn_weight = torch.tensor(attn_weight, device=alignments.device)
-            attn_loss = attn_weight * self.guided_attention_loss(
-                alignments, input_lengths, target_lengths
-            )
+            # Skip building the soft mask when it would be multiplied by zero
+            if attn_weight == 0:
+                attn_weight, attn_loss = zero_tensor, zero_tensor
+            else:
+                attn_weight = torch.tensor(
+                    attn_weight, device=alignments.device
+                )
+                # The padded sizes come from the alignments themselves, which
+                # avoids a device-to-host sync on the maximum lengths
+                attn_loss = attn_weight * self.guided_attention_loss(
+                    alignments,
+                    input_lengths,
+                    target_lengths,
+                    max_input_len=alignments.size(-1),
+                    max_target_len=alignments.size(-2),
+                )
         return attn_loss, attn_weight
 
 
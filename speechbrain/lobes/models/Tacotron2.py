@@ -1169,12 +1169,19 @@ class Decoder(nn.Module):
             [memory.size(0)], dtype=torch.int32, device=memory.device
         )
 
-        mel_outputs, gate_outputs, alignments = (
-            torch.zeros(1),
-            torch.zeros(1),
-            torch.zeros(1),
+        # Preallocate the outputs for the longest possible sequence and
+        # write each step in place, instead of growing them with torch.cat
+        batch_size = memory.size(0)
+        mel_outputs = memory.new_zeros(
+            self.max_decoder_steps,
+            batch_size,
+            self.n_mel_channels * self.n_frames_per_step,
+        )
+        gate_outputs = memory.new_zeros(self.max_decoder_steps, batch_size, 1)
+        alignments = memory.new_zeros(
+            self.max_decoder_steps, batch_size, memory.size(1)
         )
-        first_iter = True
+        step = 0
         while True:
             decoder_input = self.prenet(decoder_input)
             (
@@ -1201,17 +1208,10 @@ class Decoder(nn.Module):
                 mask,
             )
 
-            if first_iter:
-                mel_outputs = mel_output.unsqueeze(0)
-                gate_outputs = gate_output
-                alignments = attention_weights
-                first_iter = False
-            else:
-                mel_outputs = torch.cat(
-                    (mel_outputs, mel_output.unsqueeze(0)), dim=0
-                )
-                gate_outputs = torch.cat((gate_outputs, gate_output), dim=0)
-                alignments = torch.cat((alignments, attention_weights), dim=0)
+            mel_outputs[step] = mel_output
+            gate_outputs[step] = gate_output
+            alignments[step] = attention_weights
+            step += 1
 
             dec = (
                 torch.le(torch.sigmoid(gate_output), self.gate_threshold)
@@ -1223,11 +1223,14 @@ class Decoder(nn.Module):
             mel_lengths += not_finished
             if self.early_stopping and torch.sum(not_finished) == 0:
                 break
-            if len(mel_outputs) == self.max_decoder_steps:
+            if step == self.max_decoder_steps:
                 break
 
             decoder_input = mel_output
 
+        mel_outputs = mel_outputs[:step]
+        gate_outputs = gate_outputs[:step].reshape(-1, 1)
+        alignments = alignments[:step].reshape(-1, memory.size(1))
         mel_outputs, gate_outputs, alignments = self.parse_decoder_outputs(
             mel_outputs, gate_outputs, alignments
         )
@@ -1611,8 +1614,6 @@ class Loss(nn.Module):
         if guided_attention_weight == 0:
             guided_attention_weight = None
         self.guided_attention_weight = guided_attention_weight
-        self.mse_loss = nn.MSELoss()
-        self.bce_loss = nn.BCEWithLogitsLoss()
         self.guided_attention_loss = GuidedAttentionLoss(
             sigma=guided_attention_sigma
         )
@@ -1655,10 +1656,12 @@ class Loss(nn.Module):
         mel_out, mel_out_postnet, gate_out, alignments = model_output
 
         gate_out = gate_out.view(-1, 1)
-        mel_loss = self.mse_loss(mel_out, mel_target) + self.mse_loss(
+        mel_loss = F.mse_loss(mel_out, mel_target) + F.mse_loss(
             mel_out_postnet, mel_target
         )
-        gate_loss = self.gate_loss_weight * self.bce_loss(gate_out, gate_target)
+        gate_loss = self.gate_loss_weight * F.binary_cross_entropy_with_logits(
+            gate_out, gate_target
+        )
         attn_loss, attn_weight = self.get_attention_loss(
             alignments, input_lengths, target_lengths, epoch
         )
@@ -1701,15 +1704,27 @@ class Loss(nn.Module):
                 and epoch > self.guided_attention_hard_stop
             )
             if hard_stop_reached:
-                attn_weight, attn_loss = zero_tensor, zero_tensor
+                attn_weight = 0.0
             else:
                 attn_weight = self.guided_attention_weight
                 if self.guided_attention_scheduler is not None:
                     _, attn_weight = self.guided_attention_scheduler(epoch)
-            attn_weight = torch.tensor(attn_weight, device=alignments.device)
-            attn_loss = attn_weight * self.guided_attention_loss(
-                alignments, input_lengths, target_lengths
-            )
+            # Skip building the soft mask when it would be multiplied by zero
+            if attn_weight == 0:
+                attn_weight, attn_loss = zero_tensor, zero_tensor
+            else:
+                attn_weight = torch.tensor(
+                    attn_weight, device=alignments.device
+                )
+                # The padded sizes come from the alignments themselves, which
+                # avoids a device-to-host sync on the maximum lengths
+                attn_loss = attn_weight * self.guided_attention_loss(
+                    alignments,
+                    input_lengths,
+                    target_lengths,
+                    max_input_len=alignments.size(-1),
+                    max_target_len=alignments.size(-2),
+                )
         return attn_loss, attn_weight
 
 
@@ -1807,7 +1822,10 @@ class TextMelCollate:
 
 def dynamic_range_compression(x, C=1, clip_val=1e-5):
     """Dynamic range compression for audio signals"""
-    return torch.log(torch.clamp(x, min=clip_val) * C)
+    x = torch.clamp(x, min=clip_val)
+    if C != 1:
+        x = x * C
+    return torch.log(x)
 
 
 def mel_spectogram(
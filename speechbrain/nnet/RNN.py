@@ -9,6 +9,7 @@ Authors
 """
 
 import logging
+import math
 from typing import Optional
 
 import torch
@@ -124,7 +125,7 @@ class RNN(torch.nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[2:]))
+            input_size = math.prod(input_shape[2:])
 
         self.rnn = torch.nn.RNN(
             input_size=input_size,
@@ -243,7 +244,7 @@ class LSTM(torch.nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[2:])).item()
+            input_size = math.prod(input_shape[2:])
 
         self.rnn = torch.nn.LSTM(
             input_size=input_size,
@@ -361,7 +362,7 @@ class GRU(torch.nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[2:])).item()
+            input_size = math.prod(input_shape[2:])
 
         self.rnn = torch.nn.GRU(
             input_size=input_size,
@@ -482,7 +483,7 @@ class RNNCell(nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[1:]))
+            input_size = math.prod(input_shape[1:])
 
         kwargs = {
             "input_size": input_size,
@@ -526,6 +527,9 @@ class RNNCell(nn.Module):
             hx = x.new_zeros(self.num_layers, x.shape[0], self.hidden_size)
 
         h = self.rnn_cells[0](x, hx[0])
+        if self.num_layers == 1:
+            return h, h.unsqueeze(0)
+
         hidden_lst = [h]
         for i in range(1, self.num_layers):
             drop_h = self.dropout_layers[i - 1](h)
@@ -594,7 +598,7 @@ class GRUCell(nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[1:]))
+            input_size = math.prod(input_shape[1:])
 
         kwargs = {
             "input_size": input_size,
@@ -638,6 +642,9 @@ class GRUCell(nn.Module):
             hx = x.new_zeros(self.num_layers, x.shape[0], self.hidden_size)
 
         h = self.rnn_cells[0](x, hx[0])
+        if self.num_layers == 1:
+            return h, h.unsqueeze(0)
+
         hidden_lst = [h]
         for i in range(1, self.num_layers):
             drop_h = self.dropout_layers[i - 1](h)
@@ -706,7 +713,7 @@ class LSTMCell(nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[1:]))
+            input_size = math.prod(input_shape[1:])
 
         kwargs = {
             "input_size": input_size,
@@ -751,6 +758,9 @@ class LSTMCell(nn.Module):
             )
 
         h, c = self.rnn_cells[0](x, (hx[0][0], hx[1][0]))
+        if self.num_layers == 1:
+            return h, (h.unsqueeze(0), c.unsqueeze(0))
+
         hidden_lst = [h]
         cell_lst = [c]
         for i in range(1, self.num_layers):
@@ -901,7 +911,9 @@ class AttentionalRNNDecoder(nn.Module):
         else:
             raise ValueError(f"{self.attn_type} is not implemented.")
 
-        self.drop = nn.Dropout(p=self.dropout)
+        # The cell input is a fresh concatenation, so it can be dropped
+        # in place
+        self.drop = nn.Dropout(p=self.dropout, inplace=True)
 
         # set dropout to 0 when only one layer
         dropout = 0 if self.num_layers == 1 else self.dropout
@@ -1100,7 +1112,7 @@ class LiGRU(torch.nn.Module):
         # Computing the feature dimensionality
         if len(input_shape) > 3:
             self.reshape = True
-        self.fea_dim = float(torch.prod(torch.tensor(input_shape[2:])))
+        self.fea_dim = math.prod(input_shape[2:])
         self.batch_size = input_shape[0]
         self.rnn = self._init_layers()
 
@@ -1356,9 +1368,12 @@ class LiGRU_Layer(torch.nn.Module):
         # Sampling dropout mask
         drop_mask = self._sample_drop_mask(w)
 
+        # Transposed recurrent weight, shared by all time steps
+        u_t = self.u.weight.t()
+
         # Loop over time axis
         for k in range(w.shape[1]):
-            gates = w[:, k] + self.u(ht)
+            gates = torch.addmm(w[:, k], ht, u_t)
             at, zt = gates.chunk(2, 1)
             zt = torch.sigmoid(zt)
             hcand = self.act(at) * drop_mask
@@ -1411,20 +1426,12 @@ class LiGRU_Layer(torch.nn.Module):
         """This function changes the batch size when it is different from
         the one detected in the initialization method. This might happen in
         the case of multi-gpu or when we have different batch sizes in train
-        and test. We also update the h_int and drop masks.
+        and test. The dropout mask pool does not depend on the batch size:
+        it is resampled by _sample_drop_mask once it is exhausted.
         """
         if self.batch_size != x.shape[0]:
             self.batch_size = x.shape[0]
 
-            if self.training:
-                self.drop_masks = self.drop(
-                    torch.ones(
-                        self.N_drop_masks,
-                        self.hidden_size,
-                        device=x.device,
-                    )
-                ).data
-
 
 class SLiGRU(torch.nn.Module):
     """This class implements a Stabilised Light GRU (SLi-GRU).
@@ -1520,7 +1527,7 @@ class SLiGRU(torch.nn.Module):
         # Computing the feature dimensionality
         if len(input_shape) > 3:
             self.reshape = True
-        self.fea_dim = float(torch.prod(torch.tensor(input_shape[2:])))
+        self.fea_dim = math.prod(input_shape[2:])
         self.batch_size = input_shape[0]
         self.rnn = self._init_layers()
 
@@ -1844,20 +1851,12 @@ class SLiGRU_Layer(torch.nn.Module):
         """This function changes the batch size when it is different from
         the one detected in the initialization method. This might happen in
         the case of multi-gpu or when we have different batch sizes in train
-        and test. We also update the h_int and drop masks.
+        and test. The dropout mask pool does not depend on the batch size:
+        it is resampled by _sample_drop_mask once it is exhausted.
         """
         if self.batch_size != x.shape[0]:
             self.batch_size = x.shape[0]
 
-            if self.training:
-                self.drop_masks = self.drop(
-                    torch.ones(
-                        self.N_drop_masks,
-                        self.hidden_size,
-                        device=x.device,
-                    )
-                ).data
-
 
 class QuasiRNNLayer(torch.nn.Module):
     """Applies a single layer Quasi-Recurrent Neural Network (QRNN) to an
@@ -2100,7 +2099,7 @@ class QuasiRNN(nn.Module):
         if input_size is None:
             if len(input_shape) > 3:
                 self.reshape = True
-            input_size = torch.prod(torch.tensor(input_shape[2:]))
+            input_size = math.prod(input_shape[2:])
 
         layers = []
         for layer in range(self.num_layers):
@@ -366,7 +366,7 @@ class CConv2d(nn.Module):
             self.init_criterion,
         )
 
-    def forward(self, x, init_params=False):
+    def forward(self, x):
         """Returns the output of the convolution.
 
         Arguments
@@ -374,18 +374,12 @@ class CConv2d(nn.Module):
         x : torch.Tensor
             (batch, time, feature, channels).
             Input to convolve. 3d or 4d tensors are expected.
-        init_params : bool
-            Whether to initialize the parameters in this pass.
 
         Returns
         -------
         x : torch.Tensor
             The output of the convolution.
         """
-
-        if init_params:
-            self.init_params(x)
-
         # (batch, channel, feature, time)
         x = x.transpose(1, -1)
 
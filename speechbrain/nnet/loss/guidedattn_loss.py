@@ -145,15 +145,13 @@ class GuidedAttentionLoss(nn.Module):
         soft_mask: torch.Tensor
             The guided attention tensor of shape (batch, max_input_len, max_target_len)
         """
-        input_lengths_broad = input_lengths.view(-1, 1, 1)
-        target_lengths_broad = target_lengths.view(-1, 1, 1)
         if max_input_len is None:
             max_input_len = input_lengths.max()
         if max_target_len is None:
             max_target_len = target_lengths.max()
         input_mesh, target_mesh = torch.meshgrid(
-            torch.arange(max_input_len).to(input_lengths.device),
-            torch.arange(max_target_len).to(target_lengths.device),
+            torch.arange(max_input_len, device=input_lengths.device),
+            torch.arange(max_target_len, device=target_lengths.device),
         )
         input_mesh, target_mesh = (
             input_mesh.unsqueeze(0),
@@ -0,0 +1,61 @@
+import torch
+
+
+def test_hifigan_generator_gradient_checkpointing(device):
+    from speechbrain.lobes.models.HifiGAN import HifiganGenerator
+
+    kwargs = {
+        "in_channels": 8,
+        "out_channels": 1,
+        "resblock_type": "1",
+        "resblock_dilation_sizes": [[1, 3], [1, 3]],
+        "resblock_kernel_sizes": [3, 5],
+        "upsample_kernel_sizes": [4, 4],
+        "upsample_initial_channel": 16,
+        "upsample_factors": [2, 2],
+    }
+
+    torch.manual_seed(0)
+    net = HifiganGenerator(**kwargs).to(device)
+    net_ckpt = HifiganGenerator(**kwargs, gradient_checkpointing=True).to(
+        device
+    )
+    net_ckpt.load_state_dict(net.state_dict())
+    net.train()
+    net_ckpt.train()
+
+    inputs = torch.randn(2, 8, 10, device=device)
+    output = net(inputs)
+    output_ckpt = net_ckpt(inputs)
+    assert torch.allclose(output, output_ckpt, atol=1e-6)
+
+    output.sum().backward()
+    output_ckpt.sum().backward()
+    params_ckpt = dict(net_ckpt.named_parameters())
+    for name, param in net.named_parameters():
+        assert param.grad is not None, name
+        assert torch.allclose(
+            param.grad, params_ckpt[name].grad, atol=1e-5
+        ), name
+
+
+def test_hifigan_multiscale_discriminator_loss(device):
+    from speechbrain.lobes.models.HifiGAN import MSEDLoss, _apply_D_loss
+
+    # one score tensor per discriminator scale, with different shapes
+    scores_real = [
+        torch.full((2, 1, 6), 0.5, device=device),
+        torch.zeros(2, 1, 3, device=device),
+    ]
+    scores_fake = [
+        torch.full((2, 1, 6), 0.5, device=device),
+        torch.ones(2, 1, 3, device=device),
+    ]
+    loss, real_loss, fake_loss = _apply_D_loss(
+        scores_fake, scores_real, MSEDLoss()
+    )
+
+    # per-scale MSE w.r.t. 1 (real) and 0 (fake): 0.25 + 1.0 each
+    assert torch.isclose(real_loss, torch.tensor(1.25, device=device))
+    assert torch.isclose(fake_loss, torch.tensor(1.25, device=device))
+    assert torch.isclose(loss, real_loss + fake_loss)
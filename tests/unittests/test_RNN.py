@@ -167,3 +167,39 @@ def test_RNN(device):
         torch.lt(torch.add(hn_t[1], -hn[1]), 1e-3)
     ), "RNNCell hidden states mismatch"
     assert torch.jit.trace(rnn, inputs)
+
+
+def test_RNN_cells_single_layer(device):
+
+    from speechbrain.nnet.RNN import GRUCell, LSTMCell, RNNCell
+
+    inputs = torch.randn(4, 7, device=device)
+
+    # Check RNNCell and GRUCell
+    for cell_class in [RNNCell, GRUCell]:
+        net = cell_class(hidden_size=5, input_size=7, num_layers=1).to(device)
+        h, hidden = net(inputs)
+        assert hidden.shape == (1, 4, 5)
+        assert torch.equal(hidden[0], h)
+
+        # feeding the states back in
+        h, hidden = net(inputs, hidden)
+        assert hidden.shape == (1, 4, 5)
+        assert torch.equal(hidden[0], h)
+
+    # Check LSTMCell
+    net = LSTMCell(hidden_size=5, input_size=7, num_layers=1).to(device)
+    h, (hidden, cell) = net(inputs)
+    assert hidden.shape == (1, 4, 5)
+    assert cell.shape == (1, 4, 5)
+    assert torch.equal(hidden[0], h)
+
+    # the cell state matches the one of torch.nn.LSTMCell
+    h_ref, c_ref = net.rnn_cells[0](inputs)
+    assert torch.allclose(hidden[0], h_ref)
+    assert torch.allclose(cell[0], c_ref)
+
+    h, (hidden, cell) = net(inputs, (hidden, cell))
+    assert hidden.shape == (1, 4, 5)
+    assert cell.shape == (1, 4, 5)
+    assert torch.equal(hidden[0], h)
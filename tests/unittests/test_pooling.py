@@ -34,24 +34,15 @@ def test_pooling2d(device):
     output = pool(input)
     assert output == 6
 
-    input = (
-        torch.tensor([[1, 3, 2], [4, 6, 5]], device=device).float().unsqueeze(0)
-    )
     pool = Pooling2d("max", (1, 3)).to(device)
     output = pool(input)
     assert output[0][0] == 3
     assert output[0][1] == 6
 
-    input = (
-        torch.tensor([[1, 3, 2], [4, 6, 5]], device=device).float().unsqueeze(0)
-    )
     pool = Pooling2d("avg", (2, 3)).to(device)
     output = pool(input)
     assert output == 3.5
 
-    input = (
-        torch.tensor([[1, 3, 2], [4, 6, 5]], device=device).float().unsqueeze(0)
-    )
     pool = Pooling2d("avg", (1, 3)).to(device)
     output = pool(input)
     assert output[0][0] == 2
@@ -10,6 +10,11 @@ import re
 
 from speechbrain.core import run_opt_defaults
 
+# Matches the variable of each '<var>' reference, e.g. in
+# 'annotation_list_to_check: [!ref <train_csv>, !ref <valid_csv>]'. For
+# dictionary references like '<models[generator]>' only 'models' is kept.
+YAML_REF_PATTERN = re.compile(r"<([^<>\[]+)")
+
 
 def get_yaml_var(hparam_file):
     """Extracts from the input yaml file (hparams_file) the list of variables that
@@ -27,6 +32,8 @@ def get_yaml_var(hparam_file):
         included).
     """
     var_lst = []
+    declared_vars = set()
+    used_vars = set()
     with open(hparam_file) as f:
         for line in f:
             # Avoid empty lists or comments - skip pretrainer definitions
@@ -52,20 +59,52 @@ def get_yaml_var(hparam_file):
                     or "!apply" in line
                 ):
                     var_lst.append(var_name)
+                    declared_vars.add(var_name)
                 # Check for the reference pattern
                 # note: output_folder: !ref results/<experiment_name>/<seed> pattern
                 if line.find("!ref") != -1:
-                    # Check for 'annotation_list_to_check: [!ref <train_csv>, !ref <valid_csv>]' pattern
-                    for subline in line.split("<"):
-                        sub_var = subline[: subline.find(">")]
-                        # Check for 'models[generator]' pattern (dictionary reference)
-                        dict_pos = sub_var.find("[")
-                        if dict_pos != -1:
-                            sub_var = sub_var[:dict_pos]
-                        # Remove variables already used in yaml
-                        if sub_var in var_lst:
-                            var_lst.remove(sub_var)
-    return var_lst
+                    # Only variables declared above count as used in yaml
+                    used_vars.update(
+                        declared_vars.intersection(
+                            YAML_REF_PATTERN.findall(line)
+                        )
+                    )
+
+    # Remove variables already used in yaml
+    return [var for var in var_lst if var not in used_vars]
+
+
+def match_line_patterns(line):
+    """Matches the f-string and format patterns of a script line, which only
+    depend on the line and not on the variable being looked for.
+
+    Arguments
+    ---------
+    line : str
+        A line of the script file.
+
+    Returns
+    -------
+    fstr_suffix : re.Match
+        Match of a f-string with a fixed suffix (or None).
+    fstr_prefix : re.Match
+        Match of a f-string with a fixed prefix (or None).
+    re_var_pattern : str
+        Regex built from a format pattern (or None).
+    """
+    # case: hparams[f"{dataset}_annotation"] - only that structure at the moment
+    fstr_suffix = re.search(r"\[f.\{.*\}(.*).\]", line)
+    # case: getattr(self.hparams, f"{stage.name}_search".lower())
+    if fstr_suffix is None:
+        fstr_suffix = re.search(r"self\.hparams, f\"\{.*\}(.*)\"", line)
+    # case: hparams[f"annotation_{dataset}"] - only that structure at the moment
+    fstr_prefix = re.search(r"\[f.(.*)\{.*\}.\]", line)
+    # case: tea_enc_list.append(hparams['tea{}_enc'])
+    re_var_pattern = None
+    re_var = re.search(r"\[.(.*){}(.*).\]", line)
+    if re_var is not None:
+        re_var_pattern = re_var.group(1) + ".*" + re_var.group(2)
+    return fstr_suffix, fstr_prefix, re_var_pattern
 
 
 def detect_script_vars(script_file, var_lst):
@@ -92,36 +131,30 @@ def detect_script_vars(script_file, var_lst):
     detected_var = []
     with open(script_file) as f:
         for line in f:
+            # The line patterns do not depend on the variable
+            fstr_suffix, fstr_prefix, re_var_pattern = match_line_patterns(line)
+
             for var in var_lst:
                 # The pattern can be ["key"] or ".key"
                 if '["' + var + '"]' in line:
                     if var not in detected_var:
                         detected_var.append(var)
                         continue  # no need to go through the other cases for this var
-                # case: hparams[f"{dataset}_annotation"] - only that structure at the moment
-                re_match = re.search(r"\[f.\{.*\}(.*).\]", line)
-                # case: getattr(self.hparams, f"{stage.name}_search".lower())
-                if re_match is None:
-                    re_match = re.search(
-                        r"self\.hparams, f\"\{.*\}(.*)\"", line
-                    )
-                if re_match is not None:
-                    if re_match.group(1) in var:
+                if fstr_suffix is not None:
+                    if fstr_suffix.group(1) in var:
                         print(
                             "\t\tWARNING: potential inconsistency %s maybe used in %s (or not)."
-                            % (var, re_match.group(0))
+                            % (var, fstr_suffix.group(0))
                         )
                         if var not in detected_var:
                             detected_var.append(var)
                             continue
 
-                # case: hparams[f"annotation_{dataset}"] - only that structure at the moment
-                re_match = re.search(r"\[f.(.*)\{.*\}.\]", line)
-                if re_match is not None:
-                    if re_match.group(1) in var:
+                if fstr_prefix is not None:
+                    if fstr_prefix.group(1) in var:
                         print(
                             "\t\tWARNING: potential inconsistency %s maybe used in %s (or not)."
-                            % (var, re_match.group(0))
+                            % (var, fstr_prefix.group(0))
                         )
                         if var not in detected_var:
                             detected_var.append(var)
@@ -134,10 +167,7 @@ def detect_script_vars(script_file, var_lst):
                         if var not in detected_var:
                             detected_var.append(var)
                             continue
-                # case: tea_enc_list.append(hparams['tea{}_enc'])
-                re_var = re.search(r"\[.(.*){}(.*).\]", line)
-                if re_var is not None:
-                    re_var_pattern = re_var.group(1) + ".*" + re_var.group(2)
+                if re_var_pattern is not None:
                     re_pattern = re.search(re_var_pattern, var)
                     if re_pattern is not None:
                         if re_pattern.group() == var:
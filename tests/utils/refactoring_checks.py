@@ -15,7 +15,8 @@ import os
 import subprocess
 import sys
 from copy import deepcopy
-from glob import glob
+from glob import iglob
+from operator import attrgetter
 
 import torch  # noqa
 import yaml
@@ -175,23 +176,26 @@ def get_prediction(repo, values, updates_dir=None):
         return data
 
     # get the pretrained model (before/after yaml/interface update)
-    model = get_model(repo=repo, values=values, updates_dir=updates_dir)  # noqa
+    model = get_model(repo=repo, values=values, updates_dir=updates_dir)
+    fnx = attrgetter(values["fnx"])(model)
+    savedir = f"pretrained_models/{repo}"
 
     try:
         # simulate batch from single file
-        prediction = eval(
-            f'model.{values["fnx"]}(model.load_audio("{repo}/{values["sample"]}", savedir="pretrained_models/{repo}").unsqueeze(0), torch.tensor([1.0]))'
-        )
+        wav = model.load_audio(f'{repo}/{values["sample"]}', savedir=savedir)
+        prediction = fnx(wav.unsqueeze(0), torch.tensor([1.0]))
 
     except Exception:
         # use an example audio if no audio can be loaded
         print(f'\tWARNING - no audio found on HF: {repo}/{values["sample"]}')
-        prediction = eval(
-            f'model.{values["fnx"]}(model.load_audio("tests/samples/single-mic/example1.wav", savedir="pretrained_models/{repo}").unsqueeze(0), torch.tensor([1.0]))'
+        wav = model.load_audio(
+            "tests/samples/single-mic/example1.wav", savedir=savedir
         )
+        prediction = fnx(wav.unsqueeze(0), torch.tensor([1.0]))
 
     finally:
-        del model
+        # the bound method holds a reference to the model as well
+        del fnx, model
 
     return [sanitize(x[0]) for x in prediction]
 
@@ -231,10 +235,10 @@ def gather_expected_results(
     updates_dir = init(
         new_interfaces_git, new_interfaces_branch, new_interfaces_local_dir
     )
-    repos = map(os.path.basename, glob(f"{updates_dir}/{glob_filter}"))
+    repos = map(os.path.basename, iglob(f"{updates_dir}/{glob_filter}"))
     for repo in repos:
         # skip if results are there
-        if repo not in results.keys():
+        if repo not in results:
             # get values
             with open(f"{updates_dir}/{repo}/test.yaml") as yaml_test:
                 values = load_hyperpyyaml(yaml_test)
@@ -280,10 +284,10 @@ def gather_refactoring_results(
     updates_dir = init(
         new_interfaces_git, new_interfaces_branch, new_interfaces_local_dir
     )
-    repos = map(os.path.basename, glob(f"{updates_dir}/{glob_filter}"))
+    repos = map(os.path.basename, iglob(f"{updates_dir}/{glob_filter}"))
     for repo in repos:
         # skip if results are there
-        if "after" not in results[repo].keys():
+        if "after" not in results[repo]:
             # get values
             with open(f"{updates_dir}/{repo}/test.yaml") as yaml_test:
                 values = load_hyperpyyaml(yaml_test)
@@ -350,7 +354,7 @@ def test_performance(
 
     # Dataset preparation is assumed to be done through recipes; before running this.
     exec(values["dataio"])
-    test_datasets = deepcopy(eval(values["test_datasets"]))
+    test_datasets = eval(values["test_datasets"])
 
     # harmonise
     if type(test_datasets) is not dict:
@@ -366,13 +370,19 @@ def test_performance(
     logger = FileTrainLogger(save_file=f"{tmp_dir}/{repo}.log")
     reporting = deepcopy(values["performance"])
     for metric, specs in reporting.items():
-        reporting[metric]["tracker"] = deepcopy(
-            recipe_hparams[specs["handler"]]()
-        )
+        # the handler creates a new tracker on each call
+        reporting[metric]["tracker"] = recipe_hparams[specs["handler"]]()
 
-    test_loader_kwargs = deepcopy(recipe_hparams[values["test_loader"]])
+    # recipe_hparams is discarded right after, so a shallow copy suffices
+    test_loader_kwargs = dict(recipe_hparams[values["test_loader"]])
     del recipe_hparams
 
+    # resolve the interface function & compile the test.yaml expressions once
+    fnx = attrgetter(values["fnx"])(model)
+    predicted_expr = compile(values["predicted"], "<predicted>", "eval")
+    targeted_expr = compile(values["targeted"], "<targeted>", "eval")
+    to_stats_expr = compile(values["to_stats"], "<to_stats>", "eval")
+
     stats = {}
     for k in test_datasets.keys():  # keys are test_clean, test_other etc
         test_set = test_datasets[k]
@@ -386,20 +396,13 @@ def test_performance(
             for batch in tqdm(test_set, dynamic_ncols=True, disable=False):
                 batch = batch.to(model.device)
                 wavs, wav_lens = batch.sig
-                wavs, wav_lens = (  # noqa
-                    wavs.to(model.device),
-                    wav_lens.to(model.device),
-                )
-                predictions = eval(  # noqa
-                    f'model.{values["fnx"]}(wavs, wav_lens)'
-                )
-                predicted = eval(values["predicted"])  # noqa
-                targeted = eval(values["targeted"])  # noqa
+                predictions = fnx(wavs, wav_lens)  # noqa
+                predicted = eval(predicted_expr)  # noqa
+                targeted = eval(targeted_expr)  # noqa
                 ids = batch.id  # noqa
-                for metric in reporting.keys():
-                    reporting[metric]["tracker"].append(
-                        *eval(values["to_stats"])
-                    )
+                # note: to_stats may refer to the current metric
+                for metric, specs in reporting.items():
+                    specs["tracker"].append(*eval(to_stats_expr))
 
         stats[k] = {}
         for metric, specs in reporting.items():
@@ -438,7 +441,7 @@ if __name__ == "__main__":
 
     repos = map(
         os.path.basename,
-        glob(f'{updates_dir}/{dataset_overrides["glob_filter"]}'),
+        iglob(f'{updates_dir}/{dataset_overrides["glob_filter"]}'),
     )
     for repo in repos:
         # get values
@@ -467,11 +470,11 @@ if __name__ == "__main__":
             continue
 
         print(f"Run tests on: {repo}")
-        if repo not in results.keys():
+        if repo not in results:
             results[repo] = {}
 
         # Before refactoring
-        if "before" not in results[repo].keys():
+        if "before" not in results[repo]:
             results[repo]["before"] = test_performance(
                 repo,
                 values,
@@ -485,10 +488,7 @@ if __name__ == "__main__":
                 yaml.dump(results, yaml_out, default_flow_style=None)
 
         # After refactoring
-        if (
-            "after" not in results[repo].keys()
-            and dataset_overrides["after"] is True
-        ):
+        if "after" not in results[repo] and dataset_overrides["after"] is True:
             results[repo]["after"] = test_performance(
                 repo,
                 values,